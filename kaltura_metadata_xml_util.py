@@ -28,22 +28,29 @@ Main Features:
 
 Usage and Extension:
 - To use the script, one must pass the partner ID, admin secret, metadata profile ID, and the entry ID as arguments.
-- The script can be extended to handle bulk updates by looping over multiple entries.
+- Bulk updates of multiple entries can be applied with KalturaMetadataManager.apply_metadata_bulk, which batches the API calls into multirequests.
 - Additional functions can be implemented to support more complex metadata operations, such as conditional updates, or synchronization with external data sources.
 - Users can extend the error handling capabilities to provide more granular feedback.
 - To facilitate ease of use, consider adding an interactive command-line interface or integrating with a web-based UI.
 """
 
 import sys
+import copy
 import logging
 import argparse
-from lxml import etree as ET
-from typing import List, Any, Optional
+from contextlib import contextmanager
+from io import BytesIO
+import requests
+import xml.etree.ElementTree as ET
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from typing import List, Any, Optional, Dict, FrozenSet, NamedTuple, Union, Tuple, Iterator
 from KalturaClient import KalturaClient, KalturaConfiguration
-from KalturaClient.Plugins.Core import KalturaSessionType, KalturaFilterPager
+from KalturaClient.Plugins.Core import ( KalturaSessionType, KalturaFilterPager, KalturaDetachedResponseProfile,
+                                         KalturaResponseProfileType )
 from KalturaClient.Plugins.Metadata import ( KalturaMetadataFilter, KalturaMetadataProfile, KalturaMetadata, 
                                            KalturaMetadataObjectType )
-from KalturaClient.exceptions import KalturaException
+from KalturaClient.exceptions import KalturaException, KalturaClientException
 
 # Configuration Constants
 SERVICE_URL = "https://cdnapi-ev.kaltura.com/"
@@ -51,175 +58,229 @@ SESSION_TYPE = KalturaSessionType.ADMIN
 SESSION_DURATION = 86400
 SESSION_PRIVILEGES = '*,disableentitlement'
 SCRIPT_USER_ID = "metadata-tester"
+HTTP_POOL_SIZE = 4
 XSD_NAMESPACE_URL = 'http://www.w3.org/2001/XMLSchema'
 XSD_NAMESPACE = {'xsd': XSD_NAMESPACE_URL}
 
+# Precompiled XPath expression reading a field's enumeration values from its xsd:element
+_XP_FIELD_ENUM = etree.XPath("xsd:simpleType/xsd:restriction/xsd:enumeration/@value", namespaces=XSD_NAMESPACE)
+
 # Helper functions and classes
+class FieldInfo(NamedTuple):
+    """
+    Describes a single metadata field as defined by the profile's XSD.
+    """
+    multi_valued: bool
+    restriction: Optional[FrozenSet[str]]  # None when the field has no enumeration
+    first_restriction_value: Optional[str]
+    index: int
+    min_occurs: Optional[str]
+
+    @property
+    def has_default_value(self) -> bool:
+        """
+        Whether populate_default_values fills this field with its first enumeration value.
+        """
+        return self.restriction is not None and not self.multi_valued
+
+
+class SchemaIndex:
+    """
+    Holds the metadata fields defined by an XSD, keyed by field name and kept in schema order.
+    """
+    def __init__(self, fields: Dict[str, FieldInfo]):
+        self.fields = fields
+        self.ordinals = {name: field_info.index for name, field_info in fields.items()}
+
+    @property
+    def field_names(self) -> List[str]:
+        return list(self.fields)
+
+    def get(self, field_name: str) -> Optional[FieldInfo]:
+        return self.fields.get(field_name)
+
+
+class _LazyXml:
+    """
+    Defers serializing an element until a log record actually gets formatted.
+    """
+    def __init__(self, element: ET.Element):
+        self.element = element
+
+    def __str__(self) -> str:
+        return ET.tostring(self.element, encoding='unicode')
+
+
 class MetadataUtils:
     @staticmethod
-    def parse_xsd(xsd_string: str) -> ET.Element:
+    def parse_xsd(xsd_string: Union[str, bytes]) -> SchemaIndex:
         """
-        Parses an XSD string into an XML tree structure.
+        Streams an XSD string into a SchemaIndex, discarding each element once it has been indexed.
         """
+        if isinstance(xsd_string, str):
+            xsd_string = xsd_string.encode('utf-8')
+        fields = {}
         try:
-            parser = ET.XMLParser(resolve_entities=False)
-            return ET.fromstring(xsd_string, parser=parser)
-        except ET.XMLSyntaxError as e:
+            for _, xsd_elem in etree.iterparse(BytesIO(xsd_string), events=('end',),
+                                               tag=f'{{{XSD_NAMESPACE_URL}}}element', resolve_entities=False):
+                name = xsd_elem.get('name')
+                if name != 'metadata' and name not in fields:
+                    restriction_values = [str(value) for value in _XP_FIELD_ENUM(xsd_elem)]
+                    fields[name] = FieldInfo(
+                        multi_valued=xsd_elem.get('maxOccurs') not in (None, '1'),
+                        restriction=frozenset(restriction_values) if restriction_values else None,
+                        first_restriction_value=restriction_values[0] if restriction_values else None,
+                        index=len(fields),
+                        min_occurs=xsd_elem.get('minOccurs'),
+                    )
+                # Free the parsed element and the siblings already handled before it
+                xsd_elem.clear()
+                while xsd_elem.getprevious() is not None:
+                    del xsd_elem.getparent()[0]
+        except etree.XMLSyntaxError as e:
             logging.error(f"Error parsing XSD: {e}")
             raise
+        return SchemaIndex(fields)
 
     @staticmethod
-    def build_metadata_template(xsd_root: ET.Element) -> ET.Element:
+    def build_metadata_template(schema: SchemaIndex) -> ET.Element:
         """
-        Constructs a metadata XML template based on the provided XSD root element.
+        Constructs a metadata XML template based on the provided schema, with one empty element per field.
         """
         metadata_element = ET.Element('metadata')
-        for xsd_elem in xsd_root.findall(".//xsd:element", XSD_NAMESPACE):
-            if xsd_elem.get('name') != 'metadata':
-                ET.SubElement(metadata_element, xsd_elem.get('name')).text = ''
+        metadata_element.extend([ET.Element(field_name) for field_name in schema.field_names])
         return metadata_element
 
     @staticmethod
-    def get_metadata_template_with_values(metadata_item: KalturaMetadata, xsd_root: ET.Element) -> ET.Element:
+    def get_metadata_template_with_values(metadata_item: KalturaMetadata, schema: SchemaIndex) -> ET.Element:
         """
         Generates a metadata XML template filled with values from an existing metadata item.
         """
-        template_tree = MetadataUtils.build_metadata_template(xsd_root)
-        item_tree = ET.fromstring(metadata_item.xml)
+        template_tree = MetadataUtils.build_metadata_template(schema)
+        # The item XML is flat, index it in one pass keeping the first value of each field
+        item_values = {}
+        for item_elem in ET.fromstring(metadata_item.xml):
+            item_values.setdefault(item_elem.tag, item_elem.text)
 
         for template_elem in list(template_tree):  # Use list to avoid modification issues during iteration
             field_name = template_elem.tag
-            corresponding_item_elem = item_tree.find(f'.//{field_name}')
-            
-            if corresponding_item_elem is not None and corresponding_item_elem.text:
-                template_elem.text = corresponding_item_elem.text
+            item_text = item_values.get(field_name)
+
+            if item_text:
+                template_elem.text = item_text
             else:
-                xsd_elem = xsd_root.find(f".//xsd:element[@name='{field_name}']", XSD_NAMESPACE)
-                minOccurs = xsd_elem.get('minOccurs') if xsd_elem is not None else None
-                if minOccurs == '0':
+                if schema.fields[field_name].min_occurs == '0':
                     template_tree.remove(template_elem)
 
         # Reconstruct metadata_xml if it becomes empty
         if not list(template_tree):
-            return MetadataUtils.build_metadata_template(xsd_root)
+            return MetadataUtils.build_metadata_template(schema)
 
         return template_tree
 
     @staticmethod
     def pretty_print_element(element: ET.Element) -> str:
-        return ET.tostring(element, pretty_print=True, encoding='unicode')
-    
-    @staticmethod
-    def is_field_multi_valued(field_name: str, xsd_root: ET.Element) -> bool:
-        """
-        Determines whether a field is multi-valued based on the XSD.
-        """
-        xsd_element = xsd_root.find(f".//xsd:element[@name='{field_name}']", namespaces=XSD_NAMESPACE)
-        if xsd_element is not None:
-            return xsd_element.get('maxOccurs') not in (None, '1')
-        else:
-            logging.warning(f"XSD does not define field '{field_name}'.")
-            return False
-
-    @staticmethod
-    def get_restriction_values(field_name: str, xsd_root: ET.Element) -> List[str]:
-        """
-        Retrieves a list of allowed values for a field based on the XSD restrictions.
-        """
-        field_type_element = xsd_root.find(
-            f".//xsd:element[@name='{field_name}']/xsd:simpleType", namespaces=XSD_NAMESPACE
-        )
-        if field_type_element is None:
-            field_type_element = xsd_root.find(
-                f".//xsd:element[@name='{field_name}']/../xsd:simpleType", namespaces=XSD_NAMESPACE
-            )
-
-        if field_type_element is not None:
-            restriction = field_type_element.find('xsd:restriction', namespaces=XSD_NAMESPACE)
-            if restriction is not None:
-                return [enum.get('value') for enum in restriction.findall('xsd:enumeration', namespaces=XSD_NAMESPACE)]
-        return []
+        element = copy.deepcopy(element)  # ET.indent works in place, keep the caller's element untouched
+        ET.indent(element, space='  ')
+        return ET.tostring(element, encoding='unicode')
     
     @staticmethod
-    def find_position_for_new_element(metadata_element: ET.Element, field_name: str, xsd_root: ET.Element) -> Optional[int]:
+    def find_position_for_new_element(metadata_element: ET.Element, field_name: str, schema: SchemaIndex) -> Optional[int]:
         """
         Finds the position where the new element should be inserted in the metadata element.
         """
-        # Assume the first sequence is where the metadata fields should be ordered
-        sequence = xsd_root.find('.//xsd:complexType/xsd:sequence', XSD_NAMESPACE)
-        if sequence is not None:
-            for index, element in enumerate(sequence.findall('xsd:element', XSD_NAMESPACE)):
-                if element.get('name') == field_name:
-                    return index
-        return None
+        field_info = schema.get(field_name)
+        return field_info.index if field_info is not None else None
     
     @staticmethod
     def remove_empty_elements(parent: ET.Element, field_name: str) -> None:
         """
         Removes all empty elements with the given field name from the parent element.
         """
-        for element in parent.findall(f".//{field_name}"):
+        for element in parent.findall(field_name):
             if element.text is None or not element.text.strip():
                 parent.remove(element)
     
     @staticmethod
-    def add_value_to_metadata(metadata_element: ET.Element, field_name: str, value: Any, xsd_root: ET.Element):
+    def add_value_to_metadata(metadata_element: ET.Element, field_name: str, value: Any, schema: SchemaIndex):
         """
         Adds or updates a value for a specific field within the metadata, ensuring compliance with the XSD.
         """
         if metadata_element is None:
             raise ValueError("The metadata element provided is None.")
 
-        multi_valued = MetadataUtils.is_field_multi_valued(field_name, xsd_root)
-        restriction_values = MetadataUtils.get_restriction_values(field_name, xsd_root)
+        field_info = schema.get(field_name)
+        if field_info is None:
+            logging.warning(f"XSD does not define field '{field_name}'.")
+            multi_valued, restriction = False, None
+        else:
+            multi_valued, restriction = field_info.multi_valued, field_info.restriction
 
-        if restriction_values and value not in restriction_values:
+        text = str(value)
+        if restriction is not None and text not in restriction:
             raise ValueError(f"Value '{value}' is not allowed for field '{field_name}' based on the XSD restrictions.")
 
-        existing_elements = metadata_element.findall(f".//{field_name}")
-        
-        # Check if the field is multi-valued as per XSD and adjust processing accordingly
+        existing_elements = metadata_element.findall(field_name)
+
+        # Multi-valued fields only overwrite the empty placeholder seeded by the template, if any,
+        # so no empty elements are left behind and no cleanup pass is needed
         if multi_valued:
-            if not any(elem.text == str(value) for elem in existing_elements):
-                new_value_element = ET.Element(field_name)
-                new_value_element.text = str(value)
-                insert_position = MetadataUtils.find_insert_position(metadata_element, field_name, xsd_root)
-                metadata_element.insert(insert_position, new_value_element)
+            if any(elem.text == text for elem in existing_elements):
+                return
+            existing_elements = [elem for elem in existing_elements if elem.text is None or not elem.text.strip()]
+
+        if existing_elements:
+            existing_elements[0].text = text
         else:
-            if existing_elements:
-                existing_elements[0].text = str(value)
-            else:
-                new_value_element = ET.Element(field_name)
-                new_value_element.text = str(value)
-                insert_position = MetadataUtils.find_insert_position(metadata_element, field_name, xsd_root)
-                metadata_element.insert(insert_position, new_value_element)
+            new_value_element = ET.Element(field_name)
+            new_value_element.text = text
+            insert_position = MetadataUtils.find_insert_position(metadata_element, field_name, schema)
+            metadata_element.insert(insert_position, new_value_element)
 
-        if multi_valued:
-            MetadataUtils.remove_empty_elements(metadata_element, field_name)
-            
     @staticmethod
-    def find_insert_position(metadata_element: ET.Element, field_name: str, xsd_root: ET.Element) -> int:
+    def find_insert_position(metadata_element: ET.Element, field_name: str, schema: SchemaIndex) -> int:
         """
-        Determines the correct position to insert a new element within the metadata structure.
+        Determines the correct position to insert a new element within the metadata structure,
+        i.e. right after every existing element whose field comes before or at field_name in the XSD.
         """
-        sequence = xsd_root.find('.//xsd:complexType/xsd:sequence', XSD_NAMESPACE)
-        if sequence is not None:
-            position = 0
-            for xsd_elem in sequence.findall('xsd:element', XSD_NAMESPACE):
-                if xsd_elem.get('name') == field_name:
-                    return position
-                if metadata_element.find(f".//{xsd_elem.get('name')}") is not None:
-                    position += len(metadata_element.findall(f".//{xsd_elem.get('name')}"))
-        return position
+        ordinals = schema.ordinals
+        unknown = len(ordinals)
+        target = ordinals.get(field_name, unknown)
+        return sum(1 for child in metadata_element if ordinals.get(child.tag, unknown) <= target)
+
+# One keep-alive session shared by every API call, so consecutive calls reuse the same TLS connection
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE))
+
+
+class KeepAliveKalturaClient(KalturaClient):
+    """
+    KalturaClient that sends its requests through the shared keep-alive session instead of a new connection per call.
+    """
+    @staticmethod
+    def openRequestUrl(url, params, files, requestHeaders, requestTimeout):
+        # File uploads are not used by this script, leave their multipart encoding to the stock client
+        if files:
+            return KalturaClient.openRequestUrl(url, params, files, requestHeaders, requestTimeout)
+        requestHeaders['Accept'] = 'text/xml'
+        requestHeaders['Accept-encoding'] = 'gzip'
+        requestHeaders['Content-Type'] = 'application/json'
+        try:
+            return _HTTP_SESSION.post(url, json=params.get() or None, headers=requestHeaders, timeout=requestTimeout)
+        except Exception as e:
+            raise KalturaClientException(e, KalturaClientException.ERROR_CONNECTION_FAILED)
+
 
 class KalturaMetadataManager:
     def __init__(self, partner_id: int, admin_secret: str):
         self.client = self._create_client(partner_id, admin_secret)
+        # Known metadata state per (entry_id, profile_id), saves repeated metadata.list calls
+        self._md_cache: Dict[Tuple[str, int], Tuple[bool, Optional[KalturaMetadata]]] = {}
 
     def _create_client(self, partner_id: int, admin_secret: str) -> KalturaClient:
         config = KalturaConfiguration(partner_id)
         config.serviceUrl = SERVICE_URL
-        client = KalturaClient(config)
+        client = KeepAliveKalturaClient(config)
         ks = client.generateSessionV2(
             admin_secret, SCRIPT_USER_ID, SESSION_TYPE,
             partner_id, SESSION_DURATION, SESSION_PRIVILEGES)
@@ -229,97 +290,200 @@ class KalturaMetadataManager:
     def fetch_metadata_profile(self, profile_id: int) -> str:
         """
         Fetches the XSD string of a metadata profile from the Kaltura platform.
+        Only the xsd field is requested, the rest of the profile isn't serialized or sent back.
         """
+        previous_response_profile = self.client.requestConfiguration.get('responseProfile')
+        self.client.setResponseProfile(KalturaDetachedResponseProfile(
+            type=KalturaResponseProfileType.INCLUDE_FIELDS, fields='xsd'))
         try:
             metadata_profile: KalturaMetadataProfile = self.client.metadata.metadataProfile.get(profile_id)
             return metadata_profile.xsd
         except KalturaException as e:
             logging.error("Error fetching metadata profile: %s", e)
             raise
+        finally:
+            # The response profile is part of the client's request configuration, restore whatever was set before
+            if previous_response_profile is None:
+                self.client.requestConfiguration.pop('responseProfile', None)
+            else:
+                self.client.setResponseProfile(previous_response_profile)
 
-    def check_metadata_exists(self, entry_id: str, profile_id: int) -> bool:
+    @staticmethod
+    def _entry_metadata_filter(entry_id: str, profile_id: int) -> KalturaMetadataFilter:
         """
-        Checks if metadata already exists for a given entry and profile ID.
+        Builds the filter matching the metadata of a given entry and profile ID.
         """
         filter = KalturaMetadataFilter()
         filter.metadataProfileIdEqual = profile_id
         filter.metadataObjectTypeEqual = KalturaMetadataObjectType.ENTRY
         filter.objectIdEqual = entry_id
+        return filter
+
+    @contextmanager
+    def _multi_request(self) -> Iterator[None]:
+        """
+        Queues the calls made inside the block as one multirequest. The client is always taken out of
+        multirequest mode afterwards, since doMultiRequest only resets it when the whole request succeeds.
+        """
+        self.client.startMultiRequest()
+        try:
+            yield
+        finally:
+            self.client.multiRequestReturnType = None
+            self.client.callsQueue = []
+
+    def check_metadata_exists(self, entry_id: str, profile_id: int) -> Tuple[bool, Optional[KalturaMetadata]]:
+        """
+        Checks if metadata already exists for a given entry and profile ID.
+        """
+        cached = self._md_cache.get((entry_id, profile_id))
+        if cached is not None:
+            return cached
+
+        filter = self._entry_metadata_filter(entry_id, profile_id)
         pager = KalturaFilterPager()
 
         result = self.client.metadata.metadata.list(filter, pager).objects
-        return len(result) > 0, result[0] if result else None
+        self._md_cache[(entry_id, profile_id)] = len(result) > 0, result[0] if result else None
+        return self._md_cache[(entry_id, profile_id)]
 
-    def create_or_get_metadata(self, entry_id: str, profile_id: int, xsd_root: ET.Element) -> ET.Element:
+    def _cache_metadata(self, metadata: KalturaMetadata) -> KalturaMetadata:
+        """
+        Records a metadata item returned by the API as the current state of its entry and profile.
+        """
+        self._md_cache[(metadata.objectId, metadata.metadataProfileId)] = True, metadata
+        return metadata
+
+    def create_or_get_metadata(self, entry_id: str, profile_id: int, schema: SchemaIndex) -> Tuple[ET.Element, Optional[KalturaMetadata]]:
         """
         Creates a new or retrieves existing metadata XML for an entry based on its profile.
+        Also returns the existing metadata item, if any, so it can be passed on to apply_metadata_to_entry.
         """
         metadata_exists, metadata_item = self.check_metadata_exists(entry_id, profile_id)
         if metadata_exists and metadata_item:
-            metadata_xml = MetadataUtils.get_metadata_template_with_values(metadata_item, xsd_root)
+            metadata_xml = MetadataUtils.get_metadata_template_with_values(metadata_item, schema)
         else:
-            metadata_xml = MetadataUtils.build_metadata_template(xsd_root)
-            self.populate_default_values(metadata_xml, xsd_root, skip_optional=True)
-        return metadata_xml
+            metadata_xml = MetadataUtils.build_metadata_template(schema)
+            self.populate_default_values(metadata_xml, schema, skip_optional=True)
+        return metadata_xml, metadata_item
 
-    def populate_default_values(self, metadata_xml: ET.Element, xsd_root: ET.Element, skip_optional: bool = False) -> None:
+    def populate_default_values(self, metadata_xml: ET.Element, schema: SchemaIndex, skip_optional: bool = False) -> None:
         """
         Populates default values for list types based on XSD enumeration restrictions.
         If an empty value is not allowed, the first value in the enumeration is selected.
         """
-        for xsd_elem in xsd_root.findall(".//xsd:element", XSD_NAMESPACE):
-            name = xsd_elem.get('name')
-            minOccurs = xsd_elem.get('minOccurs')
-            is_optional = minOccurs == '0'
+        # Index the flat metadata once, keeping the first element of each field as find() would
+        metadata_index = {}
+        for metadata_element in metadata_xml:
+            metadata_index.setdefault(metadata_element.tag, metadata_element)
 
-            # Skip metadata root element
-            if name == 'metadata':
-                continue
+        for name, field_info in schema.fields.items():
+            is_optional = field_info.min_occurs == '0'
 
-            metadata_element = metadata_xml.find(f".//{name}")
+            metadata_element = metadata_index.get(name)
             # Check if metadata_element is in the XML. If not, it was optional and already removed.
             if metadata_element is None:
                 continue
 
             # Populate with default value if restrictions exist and it's not multi-valued
-            restriction_values = MetadataUtils.get_restriction_values(name, xsd_root)
-            if restriction_values and not MetadataUtils.is_field_multi_valued(name, xsd_root):
-                first_value = restriction_values[0]
+            if field_info.has_default_value:
                 if not metadata_element.text or not metadata_element.text.strip():
-                    metadata_element.text = first_value
+                    metadata_element.text = field_info.first_restriction_value
             elif is_optional and skip_optional:
                 # For optional fields with no default value, set to empty if skipping
                 metadata_element.text = ''
     
-    def update_metadata(self, metadata_id: int, xml: str) -> KalturaMetadata:
+    def update_metadata(self, metadata_id: int, xml: Union[str, bytes]) -> KalturaMetadata:
         """
         Updates an existing metadata entry with new XML content.
         """
         try:
-            return self.client.metadata.metadata.update(metadata_id, xml)
+            return self._cache_metadata(self.client.metadata.metadata.update(metadata_id, xml))
         except KalturaException as e:
             logging.error(f"Error updating metadata: {e}")
             raise
 
-    def add_metadata(self, profile_id: int, object_type: KalturaMetadataObjectType, object_id: str, xml: str) -> KalturaMetadata:
+    def add_metadata(self, profile_id: int, object_type: KalturaMetadataObjectType, object_id: str, xml: Union[str, bytes]) -> KalturaMetadata:
         """
         Adds new metadata to an entry in the Kaltura platform.
         """
         try:
-            return self.client.metadata.metadata.add(profile_id, object_type, object_id, xml)
+            return self._cache_metadata(self.client.metadata.metadata.add(profile_id, object_type, object_id, xml))
         except KalturaException as e:
             logging.error(f"Error adding metadata: {e}")
             raise
 
-    def apply_metadata_to_entry(self, entry_id: str, profile_id: int, xml: str) -> KalturaMetadata:
+    def apply_metadata_to_entry(self, entry_id: str, profile_id: int, xml: Union[str, bytes],
+                                metadata_item: Optional[KalturaMetadata] = None) -> KalturaMetadata:
         """
         Applies metadata updates to a specific entry, either by adding or updating.
+        When the entry's existing metadata_item is already known, it is updated directly without another lookup.
         """
-        metadata_exists, metadata_item = self.check_metadata_exists(entry_id, profile_id)
-        if metadata_exists:
+        if metadata_item is None and (entry_id, profile_id) in self._md_cache:
+            metadata_exists, metadata_item = self._md_cache[(entry_id, profile_id)]
+            if not metadata_exists:
+                return self.add_metadata(profile_id, KalturaMetadataObjectType.ENTRY, entry_id, xml)
+        if metadata_item is not None:
             return self.update_metadata(metadata_item.id, xml)
-        else:
-            return self.add_metadata(profile_id, KalturaMetadataObjectType.ENTRY, entry_id, xml)
+
+        # Look up and update in a single multirequest, letting the server resolve the metadata ID
+        with self._multi_request():
+            list_result = self.client.metadata.metadata.list(self._entry_metadata_filter(entry_id, profile_id), KalturaFilterPager())
+            self.client.metadata.metadata.update(list_result.objects[0].id, xml)
+            list_response, update_response = self.client.doMultiRequest()
+
+        if not isinstance(update_response, KalturaException):
+            return self._cache_metadata(update_response)
+        if isinstance(list_response, KalturaException):
+            # The update only failed because its ID reference had nothing to resolve, report the lookup error
+            logging.error(f"Error looking up metadata: {list_response}")
+            raise list_response
+        if list_response.objects:
+            # The metadata exists and the update itself was rejected
+            logging.error(f"Error updating metadata: {update_response}")
+            raise update_response
+        return self.add_metadata(profile_id, KalturaMetadataObjectType.ENTRY, entry_id, xml)
+
+    def apply_metadata_bulk(self, profile_id: int,
+                            xml_per_entry: Dict[str, Union[str, bytes]]) -> List[Union[KalturaMetadata, KalturaException]]:
+        """
+        Applies metadata updates to several entries in at most two API round trips: one multirequest looking up
+        the entries whose metadata state isn't known yet, and one multirequest adding or updating all of them.
+        xml_per_entry maps each entry ID to its metadata XML, so every entry is applied exactly once.
+        Results are returned in xml_per_entry order, a failed entry gets its KalturaException instead of raising.
+        """
+        entry_ids = list(xml_per_entry)
+        results: Dict[str, Union[KalturaMetadata, KalturaException]] = {}
+
+        unknown_entry_ids = [entry_id for entry_id in entry_ids if (entry_id, profile_id) not in self._md_cache]
+        if unknown_entry_ids:
+            with self._multi_request():
+                for entry_id in unknown_entry_ids:
+                    self.client.metadata.metadata.list(self._entry_metadata_filter(entry_id, profile_id), KalturaFilterPager())
+                list_responses = self.client.doMultiRequest()
+            for entry_id, list_response in zip(unknown_entry_ids, list_responses):
+                if isinstance(list_response, KalturaException):
+                    results[entry_id] = list_response
+                else:
+                    objects = list_response.objects
+                    self._md_cache[(entry_id, profile_id)] = len(objects) > 0, objects[0] if objects else None
+
+        pending_entry_ids = [entry_id for entry_id in entry_ids if entry_id not in results]
+        with self._multi_request():
+            for entry_id in pending_entry_ids:
+                metadata_exists, metadata_item = self._md_cache[(entry_id, profile_id)]
+                if metadata_exists:
+                    self.client.metadata.metadata.update(metadata_item.id, xml_per_entry[entry_id])
+                else:
+                    self.client.metadata.metadata.add(profile_id, KalturaMetadataObjectType.ENTRY, entry_id, xml_per_entry[entry_id])
+            results.update(zip(pending_entry_ids, self.client.doMultiRequest()))
+
+        for entry_id, result in results.items():
+            if isinstance(result, KalturaException):
+                logging.error(f"Error applying metadata to entry {entry_id}: {result}")
+            else:
+                self._cache_metadata(result)
+        return [results[entry_id] for entry_id in entry_ids]
         
 
 def parse_arguments() -> argparse.Namespace:
@@ -345,24 +509,24 @@ def main():
     
     # parse the schema
     xsd_string = kaltura_manager.fetch_metadata_profile(args.profile_id)
-    xsd_root = MetadataUtils.parse_xsd(xsd_string)
+    schema = MetadataUtils.parse_xsd(xsd_string)
     
     # create a metadata template or fetch an existing metadata item xml from the API
-    metadata_xml = kaltura_manager.create_or_get_metadata(args.entry_id, args.profile_id, xsd_root)
+    metadata_xml, metadata_item = kaltura_manager.create_or_get_metadata(args.entry_id, args.profile_id, schema)
     
     try:
         # make updates to specific fields
-        logging.debug("Metadata XML before update: %s", ET.tostring(metadata_xml, encoding='unicode'))
-        MetadataUtils.add_value_to_metadata(metadata_xml, 'Email', 'someone@test.com', xsd_root)
-        logging.debug("Metadata XML after Email update: %s", ET.tostring(metadata_xml, encoding='unicode'))
-        MetadataUtils.add_value_to_metadata(metadata_xml, 'Email', 'someone@example.com', xsd_root) # will override the previous value
-        logging.debug("Metadata XML after 2nd Email update: %s", ET.tostring(metadata_xml, encoding='unicode'))
-        MetadataUtils.add_value_to_metadata(metadata_xml, 'Format', 'Go-Pro camera', xsd_root)
-        logging.debug("Metadata XML after Format update: %s", ET.tostring(metadata_xml, encoding='unicode'))
-        MetadataUtils.add_value_to_metadata(metadata_xml, 'Categories', 'Testimonials', xsd_root) 
-        logging.debug("Metadata XML after Categories/Testimonials update: %s", ET.tostring(metadata_xml, encoding='unicode'))
-        MetadataUtils.add_value_to_metadata(metadata_xml, 'Categories', 'Nature party', xsd_root) 
-        logging.debug("Metadata XML after Categories/Nature party update: %s", ET.tostring(metadata_xml, encoding='unicode'))
+        logging.debug("Metadata XML before update: %s", _LazyXml(metadata_xml))
+        MetadataUtils.add_value_to_metadata(metadata_xml, 'Email', 'someone@test.com', schema)
+        logging.debug("Metadata XML after Email update: %s", _LazyXml(metadata_xml))
+        MetadataUtils.add_value_to_metadata(metadata_xml, 'Email', 'someone@example.com', schema) # will override the previous value
+        logging.debug("Metadata XML after 2nd Email update: %s", _LazyXml(metadata_xml))
+        MetadataUtils.add_value_to_metadata(metadata_xml, 'Format', 'Go-Pro camera', schema)
+        logging.debug("Metadata XML after Format update: %s", _LazyXml(metadata_xml))
+        MetadataUtils.add_value_to_metadata(metadata_xml, 'Categories', 'Testimonials', schema) 
+        logging.debug("Metadata XML after Categories/Testimonials update: %s", _LazyXml(metadata_xml))
+        MetadataUtils.add_value_to_metadata(metadata_xml, 'Categories', 'Nature party', schema) 
+        logging.debug("Metadata XML after Categories/Nature party update: %s", _LazyXml(metadata_xml))
         
         logging.debug("Metadata updated successfully.")
         
@@ -371,7 +535,8 @@ def main():
     
     try:
         # add or update the metadata item to the entry
-        updated_metadata = kaltura_manager.apply_metadata_to_entry(args.entry_id, args.profile_id, ET.tostring(metadata_xml, encoding='unicode'))
+        # (serialized as str: KalturaParams.put decodes bytes back to str before the JSON body is built)
+        updated_metadata = kaltura_manager.apply_metadata_to_entry(args.entry_id, args.profile_id, ET.tostring(metadata_xml, encoding='unicode'), metadata_item)
         logging.debug(f"Metadata for entry {args.entry_id} has been upsert.")
         
     except KalturaException as e: